@@ -1,8 +1,10 @@
 
+import functools
 import logging
 import re
 import google.generativeai as genai
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -18,24 +20,52 @@ if not GEMINI_API_KEY:
     raise RuntimeError("GEMINI_API_KEY not set in .env file")
 genai.configure(api_key=GEMINI_API_KEY)
 
-
-def _translate_batch(text_batch: str, lang_name: str) -> str:
-    prompt = f"""
-Translate the following text to {lang_name}. Preserve any [Fig_x: ...] tags exactly as they are. 
+# Translation prompt; only the language and text vary between calls
+_PROMPT_TEMPLATE = """
+Translate the following text to {lang}. Preserve any [Fig_x: ...] tags exactly as they are. 
 Only return the translated text. Do not add explanations.
 
 Text:
-{text_batch.strip()}
+{body}
 """
+
+# Shared Gemini model, created on first use and reused across calls
+_MODEL = None
+
+
+def _get_model():
+    global _MODEL
+    if _MODEL is None:
+        _MODEL = genai.GenerativeModel(GEMINI_MODEL_NAME)
+    return _MODEL
+
+
+# Each cache entry holds a whole transcript and its translation, so keep only a few
+TRANSLATION_CACHE_SIZE = 32
+
+
+@functools.lru_cache(maxsize=TRANSLATION_CACHE_SIZE)
+def _translate_batch_cached(text_batch: str, lang_name: str) -> str:
+    # Raises on failure so that only successful translations are cached
+    prompt = _PROMPT_TEMPLATE.format(lang=lang_name, body=text_batch.strip())
+    model = _get_model()
+    response = model.generate_content(prompt)
+    return response.text.strip()
+
+
+def _translate_batch(text_batch: str, lang_name: str) -> str:
     try:
-        model = genai.GenerativeModel(GEMINI_MODEL_NAME)
-        response = model.generate_content(prompt)
-        return response.text.strip()
+        return _translate_batch_cached(text_batch, lang_name)
     except Exception as e:
         logging.error(f"Translation failed: {e}")
         return "[Translation failed]"
 
 
+def clear_translation_cache() -> None:
+    """Drop cached translations so the next call goes back to Gemini."""
+    _translate_batch_cached.cache_clear()
+
+
 def translate_text_to_language(text: str, target_lang: str) -> str:
     if target_lang not in SUPPORTED_LANGS:
         return f"[Translation failed: Unsupported language code '{target_lang}']"
@@ -63,15 +93,24 @@ def translate_figure_tagged_transcript_content(transcript_content: str, lang_map
         logging.error("Transcript content is empty")
         return {}
 
-    translations = {}
-    
-    for lang_code, lang_name in lang_map.items():
+    def _translate_one(lang_code, lang_name):
         logging.info(f"🔤 Translating transcript to {lang_name} ({lang_code}) using Gemini API...")
         translated = translate_text_to_language(transcript_content, lang_code)
-        translations[lang_code] = translated
         logging.info(f"✅ Translation to {lang_name} completed")
-    
-    return translations
+        return translated
+
+    # Gemini calls are I/O-bound, so run one thread per language
+    results = {}
+    with ThreadPoolExecutor(max_workers=len(lang_map) or 1) as executor:
+        futures = {
+            executor.submit(_translate_one, lang_code, lang_name): lang_code
+            for lang_code, lang_name in lang_map.items()
+        }
+        for future in as_completed(futures):
+            results[futures[future]] = future.result()
+
+    # Keep the caller's language order regardless of completion order
+    return {lang_code: results[lang_code] for lang_code in lang_map}
 
 
 def translate_figure_tagged_transcript(input_path: str = "output/transcript_with_figure_tags.txt", lang_map: dict = None) -> None:
@@ -124,7 +163,11 @@ if __name__ == "__main__":
     
     parser = argparse.ArgumentParser(description="Translate a figure-tagged transcript to Telugu using Gemini API, preserving [Fig_x: ...] tags.")
     parser.add_argument('--input', type=str, default='output/transcript_with_figure_tags.txt', help='Input transcript file (default: output/transcript_with_figure_tags.txt)')
+    parser.add_argument('--retranslate', action='store_true', help='Clear cached translations and request them from Gemini again')
     args = parser.parse_args()
+
+    if args.retranslate:
+        clear_translation_cache()
     
     # Read content and translate using string-based function
     content = read_file_content(args.input)
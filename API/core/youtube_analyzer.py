@@ -1,22 +1,30 @@
 
 import os
+import math
 import shutil
 import argparse
 import logging
 import subprocess
+import threading
 import multiprocessing
 from pathlib import Path
+from collections import deque
+from itertools import islice
 from urllib.parse import urlparse, parse_qs
-from functools import partial
+from functools import partial, lru_cache
 
 import torch
-from PIL import Image
+from PIL import Image, features as pil_features
 from tqdm import tqdm
-from skimage.metrics import structural_similarity as ssim
 import numpy as np
 import json
 from dotenv import load_dotenv
 # --- Dependency Check ---
+try:
+    import cv2
+except ImportError:
+    raise ImportError("opencv-python is not installed. Please install it with 'pip install opencv-python'")
+
 try:
     from yt_dlp import YoutubeDL
 except ImportError:
@@ -63,12 +71,47 @@ except ImportError as e:
 VIDEO_FILENAME = "downloaded_video.mp4"
 FRAMES_DIR = "temp_frames"
 SSIM_THRESHOLD = 0.95
+# SSIM window and constants, matching skimage.metrics.structural_similarity defaults
+SSIM_WIN_SIZE = 7
+SSIM_K1 = 0.01
+SSIM_K2 = 0.03
+# Frames are compared as (width, height) thumbnails; dedup only needs the similar/different decision
+SSIM_DOWNSCALE = (128, 72)
+# Threads used to delete duplicate frames; unlink is syscall-bound, so overlapping calls hides latency
+DELETE_THREADS = 16
+# Frames decoded ahead of the SSIM loop by background threads in each dedup worker
+FRAME_PREFETCH = 8
+FRAME_DECODE_THREADS = 2
+# Each parallel ffmpeg extraction process gets at least this many seconds of video
+MIN_SEGMENT_SECONDS = 30
+BLIP_MODEL_NAME = "Salesforce/blip-image-captioning-base"
+# Frames captioned per BLIP forward pass
+BLIP_BATCH_SIZE_GPU = 8
+BLIP_BATCH_SIZE_CPU = 4
+# Greedy decoding with the KV cache: captions are short, so beam search or sampling only adds decoder steps
+BLIP_GENERATE_KWARGS = {"max_new_tokens": 50, "num_beams": 1, "do_sample": False, "use_cache": True}
 AUDIO_TRANSCRIPT_FILENAME = "output/audio_transcript.txt"
 VISUAL_DESCRIPTION_FILENAME = "output/visual_description.txt"
 MERGED_TRANSCRIPT_FILENAME = "output/merged_audio_visual_transcript.txt"
 VISUAL_OBJECTS_FILENAME = "output/relevant_visual_objects.json"
 FIGURE_TAGGED_TRANSCRIPT_FILENAME = "output/transcript_with_figure_tags.txt"
 
+GEMINI_MODEL_NAME = "gemini-2.5-pro"
+# Whisper models: the faster English-only tiny model when yt-dlp reports the video as English,
+# the multilingual model with language detection otherwise. WHISPER_MODEL overrides the choice.
+WHISPER_MODEL_ENGLISH = "tiny.en"
+WHISPER_MODEL_MULTILINGUAL = "base"
+WHISPER_MODEL_OVERRIDE = os.getenv('WHISPER_MODEL')
+# Opt-in torch.compile of BLIP's vision encoder on CUDA (BLIP_COMPILE=1); needs a working triton toolchain
+BLIP_COMPILE = os.getenv('BLIP_COMPILE', '0') == '1'
+
+# SSIM threshold for dedup worker processes, set by _init_dedup_worker
+_DEDUP_THRESHOLD = None
+# Whisper models by name, each loaded on first use and reused across transcriptions
+_WHISPER_MODELS = {}
+# Gemini model shared by the merge, visual-object and figure-tag steps
+_GEMINI_MODEL = None
+
 # --- Setup ---
 def setup_logging():
     """Configures logging for the script."""
@@ -80,12 +123,23 @@ def check_ffmpeg():
         logging.error("ffmpeg not found. Please install ffmpeg and ensure it is in your system's PATH.")
         exit(1)
 
+def check_jpeg_decoder():
+    """Warns if Pillow was built without libjpeg-turbo, which makes frame decoding for captioning much slower."""
+    try:
+        has_turbo = pil_features.check_feature("libjpeg_turbo")
+    except ValueError:  # Pillow versions that predate the libjpeg_turbo feature flag
+        has_turbo = False
+    if not has_turbo:
+        logging.warning("Pillow is not using libjpeg-turbo; JPEG decoding for captioning will be slow. "
+                        "Install the official Pillow wheels (or pillow-simd) for SIMD-accelerated decoding.")
+
 # --- Core Functions ---
 
-def download_video(url: str, output_path: str) -> tuple[str, str]:
+def download_video(url: str, output_path: str) -> tuple[str, str, str | None]:
     """
-    Downloads a YouTube video and returns its path and title.
-    The title will be used to create context-aware prompts for captioning.
+    Downloads a YouTube video and returns its path, title and language.
+    The title will be used to create context-aware prompts for captioning; the language
+    (None if YouTube doesn't report one) picks the Whisper model for the audio fallback.
     """
     logging.info(f"Downloading video and metadata from URL: {url}")
     ydl_opts = {
@@ -98,18 +152,20 @@ def download_video(url: str, output_path: str) -> tuple[str, str]:
         with YoutubeDL(ydl_opts) as ydl:
             info_dict = ydl.extract_info(url, download=True)
             video_title = info_dict.get('title', 'this video')
+            video_language = info_dict.get('language')
 
         logging.info(f"Video downloaded successfully to {output_path}")
-        logging.info(f"Extracted video title: '{video_title}'")
-        return output_path, video_title
+        logging.info(f"Extracted video title: '{video_title}' (language: {video_language or 'unknown'})")
+        return output_path, video_title, video_language
     except Exception as e:
         logging.error(f"Failed to download video: {e}")
-        return None, None
+        return None, None, None
 
-def get_audio_transcript(url: str, video_path: str) -> str:
+def fetch_youtube_transcript(url: str) -> str | None:
     """
-    Extracts audio transcript. First tries youtube-transcript-api,
-    then falls back to Whisper if unavailable. Returns a timestamped transcript.
+    Fetches the timestamped transcript from youtube-transcript-api.
+    Only needs the URL, so it can run while the video is still downloading.
+    Returns None if no transcript is available.
     """
     logging.info("Attempting to fetch transcript from YouTube API...")
     try:
@@ -130,25 +186,67 @@ def get_audio_transcript(url: str, video_path: str) -> str:
         return transcript
     except (TranscriptsDisabled, NoTranscriptFound, KeyError, IndexError):
         logging.warning("YouTube API transcript not available. Falling back to Whisper.")
-        return transcribe_with_whisper(video_path)
+        return None
     except Exception as e:
         logging.error(f"An unexpected error occurred with YouTubeTranscriptApi: {e}")
         logging.warning("Falling back to Whisper.")
-        return transcribe_with_whisper(video_path)
+        return None
 
-def transcribe_with_whisper(video_path: str) -> str:
+def get_audio_transcript(url: str, video_path: str, video_language: str | None = None) -> str:
+    """
+    Extracts audio transcript. First tries youtube-transcript-api,
+    then falls back to Whisper if unavailable. Returns a timestamped transcript.
+    """
+    transcript = fetch_youtube_transcript(url)
+    if transcript is None:
+        return transcribe_with_whisper(video_path, video_language)
+    return transcript
+
+def _choose_whisper_model(video_language: str | None) -> tuple[str, str | None]:
+    """
+    Returns (model_name, language) for transcribing a video whose language yt-dlp reported.
+    language is None when Whisper should detect it itself.
+    """
+    is_english = bool(video_language) and video_language.lower().split('-')[0] == "en"
+    model_name = WHISPER_MODEL_OVERRIDE or (WHISPER_MODEL_ENGLISH if is_english else WHISPER_MODEL_MULTILINGUAL)
+    if model_name.endswith(".en"):
+        if not is_english:
+            logging.warning(f"Using English-only Whisper model '{model_name}' for a video in language '{video_language or 'unknown'}'.")
+        return model_name, "en"
+    return model_name, "en" if is_english else None
+
+def _get_whisper_model(model_name: str) -> WhisperModel:
+    """Returns the shared Whisper model of the given size, loading it on first use."""
+    if model_name not in _WHISPER_MODELS:
+        # Using a smaller, faster model for CPU execution, spread over all cores.
+        # One worker: each worker holds its own model copy, and there is only one transcription at a time.
+        _WHISPER_MODELS[model_name] = WhisperModel(
+            model_name, device="cpu", compute_type="int8",
+            cpu_threads=os.cpu_count() or 1, num_workers=1
+        )
+    return _WHISPER_MODELS[model_name]
+
+def transcribe_with_whisper(video_path: str, video_language: str | None = None, cancel_event: threading.Event = None) -> str:
     """
     Transcribes audio from a video file using faster-whisper.
-    Returns a timestamped transcript.
+    Returns a timestamped transcript. Setting cancel_event stops decoding at the next segment.
     """
     logging.info("Transcribing audio with Whisper. This may take a while...")
     try:
-        # Using a smaller, faster model for CPU execution
-        model = WhisperModel("base", device="cpu", compute_type="int8")
-        segments, _ = model.transcribe(video_path, beam_size=5)
+        model_name, language = _choose_whisper_model(video_language)
+        model = _get_whisper_model(model_name)
+        # Greedy decoding with VAD skips silence and avoids beam search overhead;
+        # segments is a generator, so they are decoded as we iterate.
+        # A known language skips Whisper's language detection.
+        segments, _ = model.transcribe(
+            video_path, beam_size=1, language=language, vad_filter=True, condition_on_previous_text=False
+        )
 
         formatted_transcript = []
         for segment in segments:
+            if cancel_event is not None and cancel_event.is_set():
+                logging.info("Whisper transcription cancelled.")
+                return "Audio transcription cancelled."
             timestamp = format_seconds_to_hhmmss(segment.start)
             text = segment.text.strip()
             formatted_transcript.append(f"[{timestamp}] {text}")
@@ -160,59 +258,220 @@ def transcribe_with_whisper(video_path: str) -> str:
         logging.error(f"Failed to transcribe audio with Whisper: {e}")
         return "Audio transcription failed."
 
+def get_video_duration(video_path: str) -> float | None:
+    """Returns the video duration in seconds using ffprobe, or None if it can't be determined."""
+    if shutil.which("ffprobe") is None:
+        return None
+    command = [
+        'ffprobe', '-v', 'error',
+        '-show_entries', 'format=duration',
+        '-of', 'default=noprint_wrappers=1:nokey=1',
+        video_path
+    ]
+    try:
+        result = subprocess.run(command, check=True, capture_output=True, text=True)
+        return float(result.stdout.strip())
+    except (subprocess.CalledProcessError, ValueError):
+        return None
+
+def _build_extract_command(video_path: str, output_dir_path: Path, start: int = None, length: int = None) -> list[str]:
+    """Builds the ffmpeg command for extracting frames, optionally limited to one time segment."""
+    command = ['ffmpeg']
+    if start is not None:
+        # -copyts keeps the original timestamps, so segment frames are numbered by their real second
+        command += ['-copyts', '-ss', str(start), '-t', str(length)]
+    command += [
+        '-i', video_path,
+        '-vf', 'fps=1,mpdecimate',
+        '-vsync', 'vfr', # Don't re-duplicate frames dropped by mpdecimate
+        '-frame_pts', '1', # Number files by timestamp (seconds) so gaps are preserved
+        '-q:v', '2', # High quality JPEGs
+        f'{output_dir_path}/frame_%06d.jpg' # Use JPG for smaller size
+    ]
+    return command
+
 def extract_frames(video_path: str, output_dir: str):
-    """Extracts frames from a video at 1 frame per second using ffmpeg."""
+    """
+    Extracts frames from a video at 1 frame per second using ffmpeg.
+    Consecutive near-identical frames are dropped in the same decode pass (mpdecimate),
+    and each kept frame is named after its second in the video (frame_000042.jpg = 00:00:42).
+    Longer videos are split into time segments that are extracted by parallel ffmpeg processes.
+    """
     logging.info(f"Extracting frames from {video_path} to {output_dir}...")
     output_dir_path = Path(output_dir)
     if output_dir_path.exists():
         shutil.rmtree(output_dir_path)
     output_dir_path.mkdir(parents=True)
 
-    command = [
-        'ffmpeg',
-        '-i', video_path,
-        '-vf', 'fps=1',
-        '-q:v', '2', # High quality JPEGs
-        f'{output_dir_path}/frame_%06d.jpg' # Use JPG for smaller size
-    ]
-    
+    duration = get_video_duration(video_path)
+    num_segments = 1
+    if duration:
+        num_segments = max(1, min(multiprocessing.cpu_count(), int(duration // MIN_SEGMENT_SECONDS)))
+
+    if num_segments == 1:
+        commands = [_build_extract_command(video_path, output_dir_path)]
+    else:
+        # Whole-second boundaries so each 1 fps sample belongs to exactly one segment
+        segment_length = math.ceil(duration / num_segments)
+        commands = [
+            _build_extract_command(video_path, output_dir_path, start, segment_length)
+            for start in range(0, math.ceil(duration), segment_length)
+        ]
+        logging.info(f"Extracting {len(commands)} segments of {segment_length}s in parallel...")
+
     try:
-        subprocess.run(command, check=True, capture_output=True, text=True)
+        with ThreadPoolExecutor(max_workers=len(commands)) as executor:
+            for future in as_completed([
+                executor.submit(subprocess.run, command, check=True, capture_output=True, text=True)
+                for command in commands
+            ]):
+                future.result()
         logging.info("Frame extraction complete.")
     except subprocess.CalledProcessError as e:
         logging.error(f"ffmpeg error during frame extraction: {e.stderr}")
         exit(1)
 
 def get_image_grayscale(image_path: str) -> np.ndarray:
-    """Reads an image and converts it to grayscale."""
-    with Image.open(image_path) as img:
-        return np.array(img.convert("L"))
+    """
+    Reads an image as a small grayscale thumbnail of SSIM_DOWNSCALE for the dedup comparator.
+    libjpeg-turbo decodes straight to grayscale at 1/4 scale (in the DCT domain), then
+    INTER_AREA brings it to the fixed comparison size.
+    """
+    img = cv2.imread(image_path, cv2.IMREAD_REDUCED_GRAYSCALE_4)
+    if img is None:
+        # cv2.imread signals missing or corrupt files by returning None rather than raising
+        raise IOError(f"Could not read image {image_path}")
+    return cv2.resize(img, SSIM_DOWNSCALE, interpolation=cv2.INTER_AREA)
+
+def _iter_grayscale_frames(frame_paths: list[str]):
+    """
+    Yields grayscale frames in order while decoding the next few in background threads.
+    OpenCV releases the GIL while decoding, so this overlaps JPEG decode with SSIM.
+    """
+    paths = iter(frame_paths)
+    with ThreadPoolExecutor(max_workers=FRAME_DECODE_THREADS) as executor:
+        pending = deque(executor.submit(get_image_grayscale, path) for path in islice(paths, FRAME_PREFETCH))
+        while pending:
+            frame_data = pending.popleft().result()
+            next_path = next(paths, None)
+            if next_path is not None:
+                pending.append(executor.submit(get_image_grayscale, next_path))
+            yield frame_data
+
+def _ssim_local_mean(img: np.ndarray) -> np.ndarray:
+    """7x7 local mean of a float image, cropped to the windows that lie fully inside it."""
+    pad = (SSIM_WIN_SIZE - 1) // 2
+    h, w = img.shape
+    mean = cv2.boxFilter(img, cv2.CV_64F, (SSIM_WIN_SIZE, SSIM_WIN_SIZE), borderType=cv2.BORDER_REFLECT)
+    return mean[pad:h - pad, pad:w - pad]
+
+def _ssim_stats(frame_data: np.ndarray) -> tuple:
+    """
+    Per-image SSIM terms: the float image, its local mean and its local mean of squares.
+    These only depend on one image, so they can be computed once and reused for every comparison.
+    """
+    x = frame_data.astype(np.float64)
+    return x, _ssim_local_mean(x), _ssim_local_mean(x * x)
+
+def _ssim_from_stats(stats_a: tuple, stats_b: tuple, data_range: float = 255) -> float:
+    """Computes the mean SSIM from two images' _ssim_stats; only the cross term is new work."""
+    x, ux, uxx = stats_a
+    y, uy, uyy = stats_b
+    uxy = _ssim_local_mean(x * y)
+
+    n = SSIM_WIN_SIZE * SSIM_WIN_SIZE
+    cov_norm = n / (n - 1)
+    vx = cov_norm * (uxx - ux * ux)
+    vy = cov_norm * (uyy - uy * uy)
+    vxy = cov_norm * (uxy - ux * uy)
+
+    c1 = (SSIM_K1 * data_range) ** 2
+    c2 = (SSIM_K2 * data_range) ** 2
+    s = ((2 * ux * uy + c1) * (2 * vxy + c2)) / ((ux * ux + uy * uy + c1) * (vx + vy + c2))
+    return float(s.mean())
+
+def fast_ssim(a: np.ndarray, b: np.ndarray, data_range: float = 255) -> float:
+    """
+    Computes the mean SSIM of two grayscale images.
+
+    Gives the same result as skimage's structural_similarity with its defaults (7x7 uniform
+    window, sample covariance, border of win_size // 2 excluded from the mean), but computes
+    the local means with OpenCV's SIMD box filter. Because the border is cropped, only windows
+    fully inside the image contribute, so the border mode doesn't affect the result.
+    """
+    return _ssim_from_stats(_ssim_stats(a), _ssim_stats(b), data_range)
+
+class _DedupFrame:
+    """A decoded grayscale frame with its lazily computed, cached SSIM statistics."""
+    __slots__ = ("data", "_stats")
+
+    def __init__(self, data: np.ndarray):
+        self.data = data
+        self._stats = None
 
-def _process_dedup_chunk(frame_paths_chunk: list[str], threshold: float) -> list[str]:
+    def ssim_stats(self) -> tuple:
+        if self._stats is None:
+            self._stats = _ssim_stats(self.data)
+        return self._stats
+
+    # Don't send the (large, recomputable) SSIM statistics back from worker processes
+    def __getstate__(self):
+        return (self.data,)
+
+    def __setstate__(self, state):
+        (self.data,) = state
+        self._stats = None
+
+def _is_similar_frame(reference: _DedupFrame, candidate: _DedupFrame, threshold: float) -> bool:
+    """
+    Checks whether candidate is a near-duplicate of reference by SSIM, reusing each frame's
+    cached statistics so the reference's terms are computed only once.
+    """
+    # get_image_grayscale always returns SSIM_DOWNSCALE thumbnails, so the shapes match
+    return _ssim_from_stats(reference.ssim_stats(), candidate.ssim_stats()) >= threshold
+
+def _init_dedup_worker(threshold: float):
+    """
+    Pool initializer: stores the SSIM threshold once per worker so tasks only carry their chunk.
+    The pool already uses every core, so OpenCV's own thread pool would only oversubscribe them.
+    """
+    global _DEDUP_THRESHOLD
+    _DEDUP_THRESHOLD = threshold
+    cv2.setNumThreads(1)
+
+def _process_dedup_chunk(frame_paths_chunk: list[str], threshold: float = None) -> tuple:
     """
     Processes a single chunk of frames for deduplication.
     This function is run by each worker process. It finds unique frames *within* its chunk.
+
+    Returns (unique_paths, first_frame, last_unique_frame) as _DedupFrame objects so the
+    boundary merge can compare neighbouring chunks without decoding those frames again.
+    The threshold defaults to the one set by _init_dedup_worker.
     """
+    if threshold is None:
+        threshold = _DEDUP_THRESHOLD
     if not frame_paths_chunk:
-        return []
+        return [], None, None
 
+    frames = _iter_grayscale_frames(frame_paths_chunk)
     local_unique_paths = [frame_paths_chunk[0]]
-    last_unique_frame_data = get_image_grayscale(frame_paths_chunk[0])
+    last_unique_frame = first_frame = _DedupFrame(next(frames))
 
-    for frame_path in frame_paths_chunk[1:]:
-        current_frame_data = get_image_grayscale(frame_path)
+    for frame_path, current_frame_data in zip(frame_paths_chunk[1:], frames):
+        current_frame = _DedupFrame(current_frame_data)
 
-        if last_unique_frame_data.shape != current_frame_data.shape:
-            h, w = last_unique_frame_data.shape
-            current_frame_data = np.array(Image.fromarray(current_frame_data).resize((w, h)))
-
-        similarity = ssim(last_unique_frame_data, current_frame_data, data_range=255)
-
-        if similarity < threshold:
+        if not _is_similar_frame(last_unique_frame, current_frame, threshold):
             local_unique_paths.append(frame_path)
-            last_unique_frame_data = current_frame_data
+            last_unique_frame = current_frame
     
-    return local_unique_paths
+    return local_unique_paths, first_frame, last_unique_frame
+
+def _remove_frame(path: str):
+    """Deletes a frame file, logging instead of raising if it can't be removed."""
+    try:
+        os.remove(path)
+    except OSError as e:
+        logging.warning(f"Could not delete duplicate frame {path}: {e}")
 
 def deduplicate_frames(frames_dir: str, threshold: float) -> list[str]:
     """
@@ -220,7 +479,8 @@ def deduplicate_frames(frames_dir: str, threshold: float) -> list[str]:
     Returns a list of paths to unique frames.
     """
     logging.info("Deduplicating frames using SSIM with multiprocessing...")
-    frame_files = sorted([str(p) for p in Path(frames_dir).glob('*.jpg')])
+    # ffmpeg's zero-padded frame_%06d.jpg names sort lexicographically in frame order
+    frame_files = sorted(entry.path for entry in os.scandir(frames_dir) if entry.name.endswith('.jpg'))
     if not frame_files:
         logging.warning("No frames found to deduplicate.")
         return []
@@ -230,10 +490,8 @@ def deduplicate_frames(frames_dir: str, threshold: float) -> list[str]:
     chunk_size = (len(frame_files) + num_workers - 1) // num_workers
     chunks = [frame_files[i:i + chunk_size] for i in range(0, len(frame_files), chunk_size)]
 
-    process_chunk_with_threshold = partial(_process_dedup_chunk, threshold=threshold)
-
-    with multiprocessing.Pool(processes=num_workers) as pool:
-        chunk_results = list(tqdm(pool.imap(process_chunk_with_threshold, chunks), total=len(chunks), desc="Deduplicating Chunks"))
+    with multiprocessing.Pool(processes=num_workers, initializer=_init_dedup_worker, initargs=(threshold,)) as pool:
+        chunk_results = list(tqdm(pool.imap(_process_dedup_chunk, chunks), total=len(chunks), desc="Deduplicating Chunks"))
 
     logging.info("Merging results and handling chunk boundaries...")
     unique_frames = []
@@ -241,69 +499,138 @@ def deduplicate_frames(frames_dir: str, threshold: float) -> list[str]:
         return []
 
     # Add all unique frames from the first chunk
-    unique_frames.extend(chunk_results[0])
+    first_chunk_paths, _, last_unique = chunk_results[0]
+    unique_frames.extend(first_chunk_paths)
     
-    # Process subsequent chunks, checking boundaries
-    for i in range(1, len(chunk_results)):
-        if not unique_frames or not chunk_results[i]:
+    # Process subsequent chunks, checking boundaries against the frames the workers already decoded
+    for chunk_paths, chunk_first, chunk_last in chunk_results[1:]:
+        if not unique_frames or not chunk_paths:
             continue
 
-        prev_chunk_last_unique_path = unique_frames[-1]
-        curr_chunk_first_unique_path = chunk_results[i][0]
-
-        last_img = get_image_grayscale(prev_chunk_last_unique_path)
-        curr_img = get_image_grayscale(curr_chunk_first_unique_path)
-        
-        if last_img.shape != curr_img.shape:
-            h, w = last_img.shape
-            curr_img = np.array(Image.fromarray(curr_img).resize((w, h)))
-
-        if ssim(last_img, curr_img, data_range=255) >= threshold:
+        if _is_similar_frame(last_unique, chunk_first, threshold):
             # They are similar, so discard the first frame of the current chunk
-            chunk_results[i].pop(0)
+            chunk_paths = chunk_paths[1:]
         
-        unique_frames.extend(chunk_results[i])
+        if chunk_paths:
+            unique_frames.extend(chunk_paths)
+            last_unique = chunk_last
 
     # Delete the duplicate frames from disk
-    all_original_paths = set(frame_files)
-    final_unique_paths = set(unique_frames)
-    paths_to_delete = all_original_paths - final_unique_paths
+    unique_paths = set(unique_frames)
+    paths_to_delete = [path for path in frame_files if path not in unique_paths]
 
-    for path in tqdm(paths_to_delete, desc="Deleting duplicate frames"):
-        try:
-            os.remove(path)
-        except OSError as e:
-            logging.warning(f"Could not delete duplicate frame {path}: {e}")
+    logging.info(f"Deleting {len(paths_to_delete)} duplicate frames...")
+    with ThreadPoolExecutor(max_workers=DELETE_THREADS) as executor:
+        executor.map(_remove_frame, paths_to_delete)
 
     logging.info(f"Found {len(unique_frames)} unique frames out of {len(frame_files)} total frames.")
-    return sorted(list(final_unique_paths))
+    # Chunks are merged in order, so unique_frames is already sorted like frame_files
+    return unique_frames
 
 def format_seconds_to_hhmmss(seconds: float) -> str:
     """Formats seconds into HH:MM:SS string."""
-    seconds = int(seconds)
-    h = seconds // 3600
-    m = (seconds % 3600) // 60
-    s = seconds % 60
+    # Truncate first so the cache is keyed on whole seconds, not unique float offsets
+    return _format_whole_seconds(int(seconds))
+
+@lru_cache(maxsize=8192)
+def _format_whole_seconds(seconds: int) -> str:
+    h, remainder = divmod(seconds, 3600)
+    m, s = divmod(remainder, 60)
     return f"{h:02d}:{m:02d}:{s:02d}"
 
 def get_timestamp_from_frame(frame_path: str) -> str:
     """Extracts the second from the frame filename and formats it as HH:MM:SS."""
     try:
         # e.g., 'temp_frames/frame_000123.jpg' -> 123
-        # ffmpeg starts frame numbering at 1, so second 0 is frame 1.
-        frame_number = int(Path(frame_path).stem.split('_')[-1])
-        seconds = frame_number - 1
+        # extract_frames numbers files by their 1 fps timestamp, so the number is the second.
+        stem = os.path.splitext(os.path.basename(frame_path))[0]
+        seconds = int(stem.rpartition('_')[2])
         return format_seconds_to_hhmmss(seconds)
-    except (IndexError, ValueError):
+    except ValueError:
         logging.warning(f"Could not parse timestamp from {frame_path}. Defaulting to 00:00:00.")
         return "00:00:00"
 
+def _cpu_supports_int8() -> bool:
+    """
+    Checks whether int8 dynamic quantization is likely to pay off on this CPU.
+    Without AVX-512 VNNI int8 dot-product instructions the int8 path can be slower than fp32; this
+    includes AVX-512 CPUs that lack VNNI, such as Skylake-SP.
+    """
+    vnni_check = getattr(getattr(torch._C, "_cpu", None), "_is_avx512_vnni_supported", None)
+    if vnni_check is not None:
+        return vnni_check()
+    # Older torch builds don't expose the check; fall back to the kernel's CPU flags (Linux only)
+    try:
+        with open("/proc/cpuinfo") as f:
+            return "avx512_vnni" in f.read().split()
+    except OSError:
+        return False
+
+def _compile_vision_model(vision_model, image_size: int, dtype, device: str):
+    """
+    Compiles BLIP's vision encoder into CUDA graphs and runs a warm-up forward pass.
+    Every frame is resized to the same input size, so the encoder runs at a fixed shape; the text
+    decoder grows by one token per step and is left eager. Compilation can fail on platforms
+    without triton (e.g. Windows) or on Python versions torch.compile doesn't support yet, and
+    some failures only surface on the first forward pass, so any error falls back to the eager module.
+    """
+    try:
+        compiled = torch.compile(vision_model, mode="reduce-overhead")
+        warmup = torch.zeros(BLIP_BATCH_SIZE_GPU, 3, image_size, image_size, dtype=dtype, device=device)
+        with torch.inference_mode():
+            compiled(pixel_values=warmup)
+        logging.info("BLIP vision encoder compiled with torch.compile.")
+        return compiled
+    except Exception as e:
+        logging.warning(f"torch.compile of the BLIP vision encoder failed ({e}); using the eager model.")
+        return vision_model
+
+def load_blip_model(device: str):
+    """
+    Loads the BLIP captioning processor and model for the given device.
+    The model is kept in half precision on CUDA (bfloat16 on Ampere and newer, float16 otherwise)
+    and int8-quantized (Linear layers) on capable CPUs.
+    """
+    processor = BlipProcessor.from_pretrained(BLIP_MODEL_NAME)
+    if str(device).startswith("cuda"):
+        # bfloat16 has float32's exponent range, so it can't overflow in the decoder's softmax like float16 can.
+        # Only use it where it's native (compute capability 8.0+); older GPUs such as T4/V100 emulate it slowly.
+        native_bf16 = torch.cuda.get_device_capability(device)[0] >= 8
+        half_dtype = torch.bfloat16 if native_bf16 else torch.float16
+        model = BlipForConditionalGeneration.from_pretrained(BLIP_MODEL_NAME, torch_dtype=half_dtype).to(device)
+        if BLIP_COMPILE:
+            model.vision_model = _compile_vision_model(model.vision_model, model.config.vision_config.image_size, half_dtype, device)
+    else:
+        model = BlipForConditionalGeneration.from_pretrained(BLIP_MODEL_NAME)
+        if _cpu_supports_int8():
+            if "onednn" in torch.backends.quantized.supported_engines:
+                torch.backends.quantized.engine = "onednn"
+            model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+            logging.info("BLIP Linear layers quantized to int8 for CPU inference.")
+        else:
+            logging.info("CPU lacks AVX-512 VNNI int8 support; keeping BLIP in float32.")
+    model.config.use_cache = True
+    model.eval()
+    return processor, model
+
+@lru_cache(maxsize=1)
+def get_blip():
+    """
+    Returns (processor, model, device) for BLIP captioning, loading it on first use.
+    The weights are cached for the life of the process, so repeated pipeline runs and API requests reuse them.
+    """
+    device = "cuda" if torch.cuda.is_available() else "cpu"
+    processor, model = load_blip_model(device)
+    logging.info(f"BLIP model loaded on device: {device}")
+    return processor, model, device
+
 def process_single_frame(frame_path, prompt, model, processor, device):
     try:
         raw_image = Image.open(frame_path).convert('RGB')
         inputs = processor(raw_image, text=prompt, return_tensors="pt").to(device)
+        inputs["pixel_values"] = inputs["pixel_values"].to(model.dtype)
         with torch.no_grad():
-            out = model.generate(**inputs, max_new_tokens=50)
+            out = model.generate(**inputs, **BLIP_GENERATE_KWARGS)
         caption = processor.decode(out[0], skip_special_tokens=True)
         timestamp = get_timestamp_from_frame(frame_path)
         return f"[{timestamp}] {caption.capitalize()}"
@@ -311,26 +638,78 @@ def process_single_frame(frame_path, prompt, model, processor, device):
         logging.error(f"Could not generate caption for {frame_path}: {e}")
         return None
 
-def generate_visual_descriptions(frame_paths: list[str], video_title: str, model, processor, device, max_workers=4) -> list[str]:
-    """Generates detailed captions for a list of image frames using BLIP in parallel."""
+def _prepare_pixel_values(frame_paths_batch: list[str], processor, pin_memory: bool) -> torch.Tensor:
+    """
+    Decodes a batch of frames and runs BLIP's image preprocessing, returning CPU pixel values.
+    Pinned memory lets the host-to-GPU copy run asynchronously.
+    """
+    images = []
+    for frame_path in frame_paths_batch:
+        with Image.open(frame_path) as img:
+            images.append(img.convert('RGB'))
+    pixel_values = processor.image_processor(images, return_tensors="pt")["pixel_values"]
+    return pixel_values.pin_memory() if pin_memory else pixel_values
+
+def _caption_batch(frame_paths_batch: list[str], timestamps_batch: list[str], pixel_values_future, prompt: str, model, processor, device) -> list[str]:
+    """
+    Captions a batch of frames with a single BLIP generate call, using pixel values prepared in the background.
+    Falls back to captioning frame by frame if the batch fails, so one bad frame doesn't drop the rest.
+    """
+    use_cuda = str(device).startswith("cuda")
+    try:
+        pixel_values = pixel_values_future.result()
+        # The tokenizer stays on this thread; fast tokenizers can't be shared across threads
+        inputs = processor.tokenizer([prompt] * len(frame_paths_batch), return_tensors="pt", padding=True).to(device)
+        inputs["pixel_values"] = pixel_values.to(device, dtype=model.dtype, non_blocking=True)
+        with torch.inference_mode(), torch.autocast(device_type="cuda", dtype=model.dtype, enabled=use_cuda):
+            out = model.generate(**inputs, **BLIP_GENERATE_KWARGS)
+        captions = processor.batch_decode(out, skip_special_tokens=True)
+    except Exception as e:
+        logging.warning(f"Batch captioning failed ({e}); retrying frames individually.")
+        results = (process_single_frame(frame_path, prompt, model, processor, device) for frame_path in frame_paths_batch)
+        return [result for result in results if result]
+
+    return [
+        f"[{timestamp}] {caption.capitalize()}"
+        for timestamp, caption in zip(timestamps_batch, captions)
+    ]
+
+def generate_visual_descriptions(frame_paths: list[str], video_title: str, model, processor, device, batch_size: int = None) -> list[str]:
+    """Generates detailed captions for a list of image frames using batched BLIP inference."""
     descriptions = []
     prompt = ""  # Leave empty or dynamically generate
     logging.info(f"Using prompt for captioning: '{prompt}' (Video context: '{video_title}')")
 
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        future_to_frame = {
-            executor.submit(process_single_frame, frame, prompt, model, processor, device): frame
-            for frame in frame_paths
-        }
-
-        for future in tqdm(as_completed(future_to_frame), total=len(frame_paths), desc="Generating Visual Descriptions"):
-            result = future.result()
-            if result:
-                descriptions.append(result)
+    use_cuda = str(device).startswith("cuda")
+    if batch_size is None:
+        batch_size = BLIP_BATCH_SIZE_GPU if use_cuda else BLIP_BATCH_SIZE_CPU
+
+    # Timestamps are parsed once up front, aligned with frame_paths
+    timestamps = [get_timestamp_from_frame(frame_path) for frame_path in frame_paths]
+    batches = [frame_paths[i:i + batch_size] for i in range(0, len(frame_paths), batch_size)]
+    prepare = partial(_prepare_pixel_values, processor=processor, pin_memory=use_cuda)
+
+    # Decode and preprocess the next batch while the current one is in generate
+    with ThreadPoolExecutor(max_workers=1) as executor, tqdm(total=len(frame_paths), desc="Generating Visual Descriptions") as progress:
+        pending = executor.submit(prepare, batches[0]) if batches else None
+        for i, batch in enumerate(batches):
+            current = pending
+            if i + 1 < len(batches):
+                pending = executor.submit(prepare, batches[i + 1])
+            start = i * batch_size
+            descriptions.extend(_caption_batch(batch, timestamps[start:start + batch_size], current, prompt, model, processor, device))
+            progress.update(len(batch))
 
     return descriptions
 
 
+def _get_gemini_model():
+    """Returns the shared Gemini model, creating it on first use."""
+    global _GEMINI_MODEL
+    if _GEMINI_MODEL is None:
+        _GEMINI_MODEL = genai.GenerativeModel(GEMINI_MODEL_NAME)
+    return _GEMINI_MODEL
+
 def generate_merged_transcript(audio_transcript: str, visual_description: str) -> str:
     """
     Merges audio and visual transcripts into a single, enhanced narrative using the Gemini API.
@@ -354,7 +733,7 @@ def generate_merged_transcript(audio_transcript: str, visual_description: str) -
     logging.info("Generating merged audio-visual transcript with Gemini 2.5 Pro...")
     
     try:
-        model = genai.GenerativeModel('gemini-2.5-pro')
+        model = _get_gemini_model()
     except Exception as e:
         logging.error(f"Failed to configure or initialize Gemini model: {e}")
         return f"Merged transcript generation failed: {e}"
@@ -469,7 +848,7 @@ def extract_relevant_visual_objects(audio_transcript: str, visual_transcript: st
         """
 
     try:
-        model = genai.GenerativeModel('gemini-2.5-pro')
+        model = _get_gemini_model()
         response = model.generate_content(prompt)
         response_text = response.text
 
@@ -553,7 +932,7 @@ def enrich_transcript_with_figures(
 
     # Send to Gemini API
     try:
-        model = genai.GenerativeModel("gemini-2.5-pro")
+        model = _get_gemini_model()
         response = model.generate_content(prompt)
 
         enriched_text = response.text.strip()
@@ -573,19 +952,11 @@ def main():
 
     setup_logging()
     check_ffmpeg()
+    check_jpeg_decoder()
 
     temp_paths_to_clean = [VIDEO_FILENAME, FRAMES_DIR]
 
-    # File reading helper functions
-    def read_file_content(filepath: str) -> str:
-        """Helper to read file content as string"""
-        try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                return f.read()
-        except Exception as e:
-            logging.error(f"Could not read file {filepath}: {e}")
-            return ""
-
+    # File writing helper functions
     def write_file_content(filepath: str, content: str) -> None:
         """Helper to write content to file"""
         try:
@@ -607,18 +978,29 @@ def main():
             logging.error(f"Could not write JSON to file {filepath}: {e}")
 
     try:
-        # 1. Download Video
-        video_path, video_title = download_video(args.url, VIDEO_FILENAME)
+        # 1. Download Video, fetching the YouTube transcript at the same time since it only needs the URL
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            transcript_future = executor.submit(fetch_youtube_transcript, args.url)
+            video_path, video_title, video_language = download_video(args.url, VIDEO_FILENAME)
+            api_transcript = transcript_future.result()
         if not video_path or not video_title:
             return  # Exit if download fails
 
-        # 2. Get Audio Transcript
-        audio_transcript = get_audio_transcript(args.url, video_path)
+        # 2 & 3. Get Audio Transcript and Extract Frames. When there is no YouTube transcript, Whisper
+        # transcribes the downloaded video in the background while ffmpeg extracts the frames.
+        whisper_cancel = threading.Event()
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            whisper_future = executor.submit(transcribe_with_whisper, video_path, video_language, whisper_cancel) if api_transcript is None else None
+            try:
+                extract_frames(video_path, FRAMES_DIR)
+            except BaseException:
+                # extract_frames exits on an ffmpeg error; stop Whisper so the executor doesn't wait
+                # for the whole transcription before the process can exit
+                whisper_cancel.set()
+                raise
+            audio_transcript = api_transcript if whisper_future is None else whisper_future.result()
         save_output(AUDIO_TRANSCRIPT_FILENAME, audio_transcript)
 
-        # 3. Extract Frames
-        extract_frames(video_path, FRAMES_DIR)
-
         # 4. Deduplicate Frames
         unique_frame_paths = deduplicate_frames(FRAMES_DIR, SSIM_THRESHOLD)
         if not unique_frame_paths:
@@ -628,12 +1010,7 @@ def main():
 
         # 5. Generate Visual Descriptions
         logging.info("Initializing BLIP model for image captioning...")
-        # Use float32 for CPU, as float16 is not well-supported and can be slower.
-        blip_processor = BlipProcessor.from_pretrained("Salesforce/blip-image-captioning-base")
-        blip_model = BlipForConditionalGeneration.from_pretrained("Salesforce/blip-image-captioning-base")
-        device = "cuda" if torch.cuda.is_available() else "cpu"
-        blip_model.to(device)
-        logging.info(f"BLIP model loaded on device: {device}")
+        blip_processor, blip_model, device = get_blip()
 
         visual_descriptions = generate_visual_descriptions(
             unique_frame_paths, video_title, blip_model, blip_processor, device
@@ -643,21 +1020,26 @@ def main():
         save_output(VISUAL_DESCRIPTION_FILENAME, visual_descriptions)
 
 
-        # 7. Generate Merged Audio-Visual Transcript
-        audio_content = read_file_content(AUDIO_TRANSCRIPT_FILENAME)
-        visual_content = read_file_content(VISUAL_DESCRIPTION_FILENAME)
+        # 7 & 8. Generate Merged Audio-Visual Transcript and Extract Relevant Visual Objects.
+        # Both only need the audio and visual content, so the two Gemini calls run concurrently.
+        # Use the in-memory results rather than re-reading the files saved above
+        audio_content = audio_transcript
+        visual_content = '\n'.join(visual_descriptions)
         
-        merged_transcript = generate_merged_transcript(audio_content, visual_content)
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            merged_future = executor.submit(generate_merged_transcript, audio_content, visual_content)
+            objects_future = executor.submit(extract_relevant_visual_objects, audio_content, visual_content)
+            merged_transcript = merged_future.result()
+            visual_objects = objects_future.result()
+
         write_file_content(MERGED_TRANSCRIPT_FILENAME, merged_transcript)
         logging.info(f"Merged audio-visual transcript saved to {MERGED_TRANSCRIPT_FILENAME}")
 
-        # 8. Extract Relevant Visual Objects
-        visual_objects = extract_relevant_visual_objects(audio_content, visual_content)
         write_json_content(VISUAL_OBJECTS_FILENAME, visual_objects)
         logging.info(f"Relevant visual objects saved to {VISUAL_OBJECTS_FILENAME}")
 
         # 9. Insert Figure Tags into Transcript
-        merged_content = read_file_content(MERGED_TRANSCRIPT_FILENAME)
+        merged_content = merged_transcript
         visual_objects_json = json.dumps(visual_objects)
         
         enriched_transcript = enrich_transcript_with_figures(merged_content, visual_objects_json)
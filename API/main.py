@@ -46,6 +46,7 @@ from core.youtube_analyzer import (
     extract_frames,
     deduplicate_frames,
     generate_visual_descriptions,
+    get_blip,
     save_output,
     generate_merged_transcript,
     extract_relevant_visual_objects,
@@ -317,7 +318,7 @@ async def download_video_endpoint(request: YouTubeUrlRequest):
         base = ensure_request_files_structure()
         video_path = os.path.join(base, request_files_cfg['video_filename'])
         # Download video
-        video_path_result, video_title = download_video(request.youtube_url, video_path)
+        video_path_result, video_title, _ = download_video(request.youtube_url, video_path)
         if not video_path_result or not video_title:
             raise Exception("Video download failed - no file or title returned")
         logging.info(f"Video downloaded successfully - {video_title}")
@@ -487,12 +488,7 @@ async def generate_visual_descriptions_endpoint():
                 }
             }
         frame_paths = [os.path.join(dedup_dir, f) for f in frame_files]
-        from transformers import BlipProcessor, BlipForConditionalGeneration
-        import torch
-        blip_processor = BlipProcessor.from_pretrained("Salesforce/blip-image-captioning-base")
-        blip_model = BlipForConditionalGeneration.from_pretrained("Salesforce/blip-image-captioning-base")
-        device = "cuda" if torch.cuda.is_available() else "cpu"
-        blip_model.to(device)
+        blip_processor, blip_model, device = get_blip()
         visual_descriptions = generate_visual_descriptions(
             frame_paths, "", blip_model, blip_processor, device
         )
@@ -4,12 +4,98 @@ Braille to Text Converter - Reverse conversion from Braille Unicode to English
 Convert Grade 1 Braille back to readable English text
 """
 
+import functools
 import json
 import os
 import sys
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'core'))
 from braille_converter import load_config
 
+# Read/write buffer for Braille files; large files otherwise need many small syscalls
+IO_BUFFER_SIZE = 1 << 20  # 1 MiB
+
+# Reverse mapping from Braille to English
+BRAILLE_TO_ENGLISH = {
+    '\u2801': 'a',  # ⠁
+    '\u2803': 'b',  # ⠃
+    '\u2809': 'c',  # ⠉
+    '\u2819': 'd',  # ⠙
+    '\u2811': 'e',  # ⠑
+    '\u280b': 'f',  # ⠋
+    '\u281b': 'g',  # ⠛
+    '\u2813': 'h',  # ⠓
+    '\u280a': 'i',  # ⠊
+    '\u281a': 'j',  # ⠚
+    '\u2805': 'k',  # ⠅
+    '\u2807': 'l',  # ⠇
+    '\u280d': 'm',  # ⠍
+    '\u281d': 'n',  # ⠝
+    '\u2815': 'o',  # ⠕
+    '\u280f': 'p',  # ⠏
+    '\u281f': 'q',  # ⠟
+    '\u2817': 'r',  # ⠗
+    '\u280e': 's',  # ⠎
+    '\u281e': 't',  # ⠞
+    '\u2825': 'u',  # ⠥
+    '\u2827': 'v',  # ⠧
+    '\u283a': 'w',  # ⠺
+    '\u282d': 'x',  # ⠭
+    '\u283d': 'y',  # ⠽
+    '\u2835': 'z',  # ⠵
+}
+
+# Braille digits (0-9)
+BRAILLE_DIGITS = {
+    '\u2803': '2',  # ⠃ (b)
+    '\u2809': '3',  # ⠉ (c)
+    '\u2819': '4',  # ⠙ (d)
+    '\u2811': '5',  # ⠑ (e)
+    '\u280b': '6',  # ⠋ (f)
+    '\u281b': '7',  # ⠛ (g)
+    '\u2813': '8',  # ⠓ (h)
+    '\u280a': '9',  # ⠊ (i)
+    '\u281a': '0',  # ⠚ (j) - '1' or '0' depending on context
+}
+
+# Braille punctuation
+BRAILLE_PUNCTUATION = {
+    '\u2802': ',',    # ⠂
+    '\u2806': ';',    # ⠆
+    '\u2812': ':',    # ⠒
+    '\u2816': '.',    # ⠖
+    '\u2826': '!',    # ⠦
+    '\u2822': '?',    # ⠢
+    '\u2836': '"',    # ⠶ (also used for parentheses)
+    '\u2824': '\'',   # ⠄
+    '\u2820': '-',    # ⠠ (also capital indicator)
+}
+
+# Special Braille indicators
+CAPITAL_INDICATOR = '\u2820'  # ⠠
+NUMBER_INDICATOR = '\u283c'   # ⠼
+
+# Lookup tables over the Braille Patterns block (U+2800-U+28FF), indexed by
+# ord(char) - 0x2800, so each cell is classified with one table lookup
+_BRAILLE_BASE = 0x2800
+_CELL_UNKNOWN, _CELL_TEXT, _CELL_CAPITAL, _CELL_NUMBER = range(4)
+
+_cell_class = bytearray(256)      # One of the _CELL_* values
+_cell_text = [''] * 256           # Letter or punctuation the cell decodes to
+_cell_letter = [''] * 256         # Letter only, for the capital indicator
+_cell_digit = [''] * 256          # Digit the cell decodes to in number mode
+for _char, _text in BRAILLE_PUNCTUATION.items():
+    _cell_class[ord(_char) - _BRAILLE_BASE] = _CELL_TEXT
+    _cell_text[ord(_char) - _BRAILLE_BASE] = _text
+for _char, _text in BRAILLE_TO_ENGLISH.items():
+    _cell_class[ord(_char) - _BRAILLE_BASE] = _CELL_TEXT
+    _cell_text[ord(_char) - _BRAILLE_BASE] = _text
+    _cell_letter[ord(_char) - _BRAILLE_BASE] = _text
+for _char, _text in BRAILLE_DIGITS.items():
+    _cell_digit[ord(_char) - _BRAILLE_BASE] = _text
+_cell_class[ord(CAPITAL_INDICATOR) - _BRAILLE_BASE] = _CELL_CAPITAL
+_cell_class[ord(NUMBER_INDICATOR) - _BRAILLE_BASE] = _CELL_NUMBER
+del _char, _text
+
 def braille_to_text(braille_text, config=None):
     """
     Convert Grade 1 Unicode Braille back to English text.
@@ -34,78 +120,59 @@ def braille_to_text(braille_text, config=None):
     
     braille_settings = config.get('braille_settings', {})
     
-    # Reverse mapping from Braille to English
-    braille_to_english = {
-        '\u2801': 'a',  # ⠁
-        '\u2803': 'b',  # ⠃
-        '\u2809': 'c',  # ⠉
-        '\u2819': 'd',  # ⠙
-        '\u2811': 'e',  # ⠑
-        '\u280b': 'f',  # ⠋
-        '\u281b': 'g',  # ⠛
-        '\u2813': 'h',  # ⠓
-        '\u280a': 'i',  # ⠊
-        '\u281a': 'j',  # ⠚
-        '\u2805': 'k',  # ⠅
-        '\u2807': 'l',  # ⠇
-        '\u280d': 'm',  # ⠍
-        '\u281d': 'n',  # ⠝
-        '\u2815': 'o',  # ⠕
-        '\u280f': 'p',  # ⠏
-        '\u281f': 'q',  # ⠟
-        '\u2817': 'r',  # ⠗
-        '\u280e': 's',  # ⠎
-        '\u281e': 't',  # ⠞
-        '\u2825': 'u',  # ⠥
-        '\u2827': 'v',  # ⠧
-        '\u283a': 'w',  # ⠺
-        '\u282d': 'x',  # ⠭
-        '\u283d': 'y',  # ⠽
-        '\u2835': 'z',  # ⠵
-    }
-    
-    # Braille digits (0-9)
-    braille_digits = {
-        '\u281a': '1',  # ⠚ (j)
-        '\u2803': '2',  # ⠃ (b)
-        '\u2809': '3',  # ⠉ (c)
-        '\u2819': '4',  # ⠙ (d)
-        '\u2811': '5',  # ⠑ (e)
-        '\u280b': '6',  # ⠋ (f)
-        '\u281b': '7',  # ⠛ (g)
-        '\u2813': '8',  # ⠓ (h)
-        '\u280a': '9',  # ⠊ (i)
-        '\u281a': '0',  # ⠚ (j) - Note: context dependent
-    }
-    
-    # Braille punctuation
-    braille_punctuation = {
-        '\u2802': ',',    # ⠂
-        '\u2806': ';',    # ⠆
-        '\u2812': ':',    # ⠒
-        '\u2816': '.',    # ⠖
-        '\u2826': '!',    # ⠦
-        '\u2822': '?',    # ⠢
-        '\u2836': '"',    # ⠶
-        '\u2836': '(',    # ⠶ (same as quote)
-        '\u2836': ')',    # ⠶ (same as quote)
-        '\u2824': '\'',   # ⠄
-        '\u2820': '-',    # ⠠ (also capital indicator)
-    }
-    
-    # Special Braille indicators
-    CAPITAL_INDICATOR = '\u2820'  # ⠠
-    NUMBER_INDICATOR = '\u283c'   # ⠼
-    
     result = []
-    i = 0
     in_number_mode = False
+    skip_next = False
     
-    while i < len(braille_text):
-        char = braille_text[i]
+    for i, char in enumerate(braille_text):
+        if skip_next:
+            # Letter already emitted after a capital indicator
+            skip_next = False
+            continue
+        
+        cell = ord(char) - _BRAILLE_BASE
+        
+        # Braille cells: classify with a single table lookup
+        if 0 <= cell < 256:
+            cell_class = _cell_class[cell]
+            
+            # Handle digits (when in number mode)
+            if in_number_mode and _cell_digit[cell]:
+                # Special case for '0' which uses same pattern as 'j'
+                if char == '\u281a':  # ⠚
+                    # Determine if it's '0' or '1' based on context
+                    # This is a simplification - in real Braille, context matters more
+                    result.append('0' if len(result) > 0 and result[-1].isdigit() else '1')
+                else:
+                    result.append(_cell_digit[cell])
+            
+            # Handle regular letters and punctuation
+            elif cell_class == _CELL_TEXT:
+                result.append(_cell_text[cell])
+                in_number_mode = False
+            
+            # Handle capital indicator
+            elif cell_class == _CELL_CAPITAL:
+                # Check if next character is a letter
+                next_cell = ord(braille_text[i + 1]) - _BRAILLE_BASE if i + 1 < len(braille_text) else -1
+                if 0 <= next_cell < 256 and _cell_letter[next_cell]:
+                    result.append(_cell_letter[next_cell].upper())
+                    skip_next = True  # The next character has been processed
+                else:
+                    # If not followed by a letter, treat as hyphen
+                    result.append('-')
+            
+            # Handle number indicator
+            elif cell_class == _CELL_NUMBER:
+                in_number_mode = True
+            
+            # Unknown Braille pattern: keep as-is
+            else:
+                result.append(char)
+                in_number_mode = False
         
         # Handle line breaks and whitespace
-        if char == '\n':
+        elif char == '\n':
             result.append('\n')
             in_number_mode = False
         elif char == ' ':
@@ -118,51 +185,19 @@ def braille_to_text(braille_text, config=None):
         elif char == '\r' and not braille_settings.get('skip_carriage_returns', True):
             result.append('\r')
         
-        # Handle capital indicator
-        elif char == CAPITAL_INDICATOR:
-            # Check if next character is a letter
-            if i + 1 < len(braille_text) and braille_text[i + 1] in braille_to_english:
-                next_char = braille_text[i + 1]
-                result.append(braille_to_english[next_char].upper())
-                i += 1  # Skip the next character as it's been processed
-            else:
-                # If not followed by a letter, treat as hyphen
-                result.append('-')
-        
-        # Handle number indicator
-        elif char == NUMBER_INDICATOR:
-            in_number_mode = True
-        
-        # Handle digits (when in number mode)
-        elif in_number_mode and char in braille_digits:
-            # Special case for '0' which uses same pattern as 'j'
-            if char == '\u281a':  # ⠚
-                # Determine if it's '0' or '1' based on context
-                # This is a simplification - in real Braille, context matters more
-                result.append('0' if len(result) > 0 and result[-1].isdigit() else '1')
-            else:
-                result.append(braille_digits[char])
-        
-        # Handle regular letters
-        elif char in braille_to_english:
-            result.append(braille_to_english[char])
-            in_number_mode = False
-        
-        # Handle punctuation
-        elif char in braille_punctuation:
-            result.append(braille_punctuation[char])
-            in_number_mode = False
-        
         # Unknown character
         else:
             # Keep unknown characters as-is
             result.append(char)
             in_number_mode = False
-        
-        i += 1
     
     return ''.join(result)
 
+@functools.lru_cache(maxsize=16)
+def _load_config_cached(config_path, mtime):
+    """Load a configuration file once per path and modification time."""
+    return load_config(config_path)
+
 def convert_braille_file(input_file, output_file, config_file='config.json'):
     """
     Convert a Braille file back to English text
@@ -173,41 +208,53 @@ def convert_braille_file(input_file, output_file, config_file='config.json'):
         config_file (str): Configuration file path
     """
     
-    # Load configuration
-    config = load_config(config_file)
+    # Load configuration, re-reading it only when the file changes on disk
+    config_path = os.path.abspath(config_file)
+    config_mtime = os.path.getmtime(config_path) if os.path.exists(config_path) else None
+    config = _load_config_cached(config_path, config_mtime)
+    
+    # Progress messages are collected and written to stdout in one call
+    messages = [
+        f"🔤 Braille to Text Converter",
+        "=" * 50,
+        f"📖 Reading Braille from '{input_file}'...",
+    ]
     
     try:
-        print(f"🔤 Braille to Text Converter")
-        print("=" * 50)
-        print(f"📖 Reading Braille from '{input_file}'...")
-        
         # Read Braille file
-        with open(input_file, 'r', encoding=config.get('encoding', 'utf-8')) as f:
+        with open(input_file, 'r', encoding=config.get('encoding', 'utf-8'),
+                  buffering=IO_BUFFER_SIZE) as f:
             braille_text = f.read()
         
-        print(f"🔄 Converting Braille to English text...")
+        messages.append(f"🔄 Converting Braille to English text...")
         
         # Convert to English
         english_text = braille_to_text(braille_text, config)
         
-        print(f"💾 Saving English text to '{output_file}'...")
+        messages.append(f"💾 Saving English text to '{output_file}'...")
         
         # Write English output
-        with open(output_file, 'w', encoding=config.get('encoding', 'utf-8')) as f:
+        with open(output_file, 'w', encoding=config.get('encoding', 'utf-8'),
+                  buffering=IO_BUFFER_SIZE) as f:
             f.write(english_text)
         
-        print(f"✅ English text saved to '{output_file}'")
-        print(f"📊 Conversion Statistics:")
-        print(f"   • Braille characters: {len(braille_text):,}")
-        print(f"   • English characters: {len(english_text):,}")
-        print(f"   • Input file: {input_file}")
-        print(f"   • Output file: {output_file}")
-        print(f"✅ Conversion completed successfully!")
+        messages.extend([
+            f"✅ English text saved to '{output_file}'",
+            f"📊 Conversion Statistics:",
+            f"   • Braille characters: {len(braille_text):,}",
+            f"   • English characters: {len(english_text):,}",
+            f"   • Input file: {input_file}",
+            f"   • Output file: {output_file}",
+            f"✅ Conversion completed successfully!",
+        ])
         
     except FileNotFoundError:
-        print(f"❌ Error: Input file '{input_file}' not found!")
+        messages.append(f"❌ Error: Input file '{input_file}' not found!")
     except Exception as e:
-        print(f"❌ Error during conversion: {str(e)}")
+        messages.append(f"❌ Error during conversion: {str(e)}")
+    finally:
+        sys.stdout.write("\n".join(messages) + "\n")
+        sys.stdout.flush()
 
 def main():
     """Main function for command-line usage"""
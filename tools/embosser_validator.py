@@ -7,6 +7,73 @@ Validates Braille files against embosser printing standards
 import os
 import re
 
+# Read buffer for Braille files; large files otherwise need many small reads
+IO_BUFFER_SIZE = 1 << 20  # 1 MiB
+
+# Characters allowed on a line: Braille patterns and spaces
+_VALID_LINE_CHARS = frozenset(map(chr, range(0x2800, 0x2900))) | {' '}
+
+# A form feed together with the newline that may follow it
+_FORM_FEED_RE = re.compile(r'\f\n?')
+
+# Fixed parts of the validation report
+_REPORT_RULE = "-" * 30
+_REPORT_HEADER = "🖨️  BRAILLE EMBOSSER VALIDATION REPORT\n" + "=" * 50 + "\n"
+_REPORT_STANDARDS_REFERENCE = "\n".join([
+    "📋 EMBOSSER STANDARDS REFERENCE",
+    _REPORT_RULE,
+    "• Line Length: Exactly 40 characters",
+    "• Page Length: Exactly 25 lines",
+    "• Page Breaks: Form feed (\\f) after every 25 lines",
+    "• Characters: Unicode Braille patterns (U+2800-U+28FF)",
+    "• Grade: Grade 1 Braille (no contractions)",
+])
+
+def _iter_pages(f, stats):
+    """
+    Yield the pages of an open Braille file one at a time.
+    
+    The file is read line by line so only the current page is held in
+    memory. A newline directly after a form feed is part of the page break.
+    Line and form feed counts are recorded in stats once the file is consumed.
+    
+    Args:
+        f: Text file object opened for reading
+        stats (dict): Receives "lines", "form_feeds" and "form_feed_lines"
+        
+    Yields:
+        tuple: (page_lines, is_last_page) with trailing empty lines removed
+    """
+    
+    def split_page(page_parts):
+        lines = ''.join(page_parts).split('\n')
+        # Remove any empty lines at the end that might be artifacts
+        while lines and lines[-1] == '':
+            lines.pop()
+        return lines
+    
+    line_num = 0
+    line = ''
+    page_parts = []
+    for line_num, line in enumerate(f, 1):
+        if '\f' not in line:
+            page_parts.append(line)
+            continue
+        
+        stats["form_feeds"] += line.count('\f')
+        stats["form_feed_lines"].append(line_num)
+        head, *tails = _FORM_FEED_RE.split(line)
+        page_parts.append(head)
+        for tail in tails:
+            yield split_page(page_parts), False
+            page_parts = [tail]
+    
+    yield split_page(page_parts), True
+    
+    # Count lines the way str.split('\n') does, including the empty
+    # line after a trailing newline
+    stats["lines"] = line_num + (1 if line_num == 0 or line.endswith('\n') else 0)
+
 def validate_embosser_format(file_path):
     """
     Validate a Braille file against embosser printing standards.
@@ -25,33 +92,11 @@ def validate_embosser_format(file_path):
         dict: Validation results with detailed report
     """
     
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-    except FileNotFoundError:
-        return {"error": f"File '{file_path}' not found"}
-    except Exception as e:
-        return {"error": f"Error reading file: {str(e)}"}
-    
-    # Split content by form feeds to get pages, but handle form feeds properly
-    # Form feeds should be standalone, not part of lines
-    content_clean = content.replace('\f\n', '\f').replace('\n\f', '\f')
-    pages = content_clean.split('\f')
-    
-    # Split each page into lines, removing empty lines caused by form feeds
-    page_lines = []
-    for page in pages:
-        lines = [line for line in page.split('\n') if line is not None]
-        # Remove any empty lines at the end that might be artifacts
-        while lines and lines[-1] == '':
-            lines.pop()
-        page_lines.append(lines)
-    
     validation_results = {
         "file_path": file_path,
-        "total_pages": len(pages),
-        "total_lines": sum(len(lines) for lines in page_lines),
-        "form_feeds": content.count('\f'),
+        "total_pages": 0,
+        "total_lines": 0,
+        "form_feeds": 0,
         "errors": [],
         "warnings": [],
         "line_length_errors": [],
@@ -59,72 +104,34 @@ def validate_embosser_format(file_path):
         "character_errors": [],
         "valid": True
     }
+    stats = {"lines": 0, "form_feeds": 0, "form_feed_lines": []}
     
-    # Braille Unicode range (U+2800 to U+28FF)
-    braille_pattern = re.compile(r'[\u2800-\u28FF]')
+    try:
+        with open(file_path, 'r', encoding='utf-8', buffering=IO_BUFFER_SIZE) as f:
+            # Validate each page as it is read
+            page_start = 0  # Lines on all previous pages, for global line numbers
+            for page_num, (lines, is_last_page) in enumerate(_iter_pages(f, stats), 1):
+                _validate_page(validation_results, page_num, lines, is_last_page, page_start)
+                page_start += len(lines)
+    except FileNotFoundError:
+        return {"error": f"File '{file_path}' not found"}
+    except (OSError, UnicodeDecodeError) as e:
+        return {"error": f"Error reading file: {str(e)}"}
     
-    # Validate each page
-    for page_num, lines in enumerate(page_lines, 1):
-        
-        # Check page length (should be exactly 25 lines for complete pages)
-        if page_num < len(pages):  # Not the last page
-            if len(lines) != 25:
-                validation_results["page_length_errors"].append({
-                    "page": page_num,
-                    "expected": 25,
-                    "actual": len(lines),
-                    "issue": f"Page {page_num} has {len(lines)} lines, expected 25"
-                })
-                validation_results["valid"] = False
-        else:  # Last page can have fewer lines
-            if len(lines) > 25:
-                validation_results["page_length_errors"].append({
-                    "page": page_num,
-                    "expected": "≤25",
-                    "actual": len(lines),
-                    "issue": f"Last page {page_num} has {len(lines)} lines, maximum 25"
-                })
-                validation_results["valid"] = False
-        
-        # Validate each line in the page
-        for line_num, line in enumerate(lines, 1):
-            global_line_num = sum(len(page_lines[i]) for i in range(page_num - 1)) + line_num
-            
-            # Check line length (should be exactly 40 characters)
-            if len(line) != 40:
-                validation_results["line_length_errors"].append({
-                    "page": page_num,
-                    "line": line_num,
-                    "global_line": global_line_num,
-                    "expected": 40,
-                    "actual": len(line),
-                    "content": line[:50] + "..." if len(line) > 50 else line
-                })
-                validation_results["valid"] = False
-            
-            # Check for valid characters (Braille Unicode + spaces + number indicator)
-            for char_pos, char in enumerate(line):
-                if char != ' ' and not braille_pattern.match(char):
-                    validation_results["character_errors"].append({
-                        "page": page_num,
-                        "line": line_num,
-                        "global_line": global_line_num,
-                        "position": char_pos + 1,
-                        "character": char,
-                        "unicode": f"U+{ord(char):04X}",
-                        "issue": f"Non-Braille character '{char}' found"
-                    })
-                    validation_results["valid"] = False
-    
-    # Check form feed placement
-    lines_all = content.split('\n')
-    form_feed_lines = [i + 1 for i, line in enumerate(lines_all) if '\f' in line]
-    expected_form_feeds = list(range(25, len(lines_all), 25))
-    
-    if form_feed_lines != expected_form_feeds[:-1]:  # Exclude last page
+    validation_results["total_pages"] = page_num
+    validation_results["total_lines"] = page_start
+    validation_results["form_feeds"] = stats["form_feeds"]
+    
+    # Check form feed placement, comparing against the expected line numbers
+    # as a range so no list is built unless a warning is reported
+    form_feed_lines = stats["form_feed_lines"]
+    expected_form_feeds = range(25, stats["lines"], 25)[:-1]  # Exclude last page
+    
+    if (len(form_feed_lines) != len(expected_form_feeds) or
+            any(actual != expected for actual, expected in zip(form_feed_lines, expected_form_feeds))):
         validation_results["warnings"].append({
             "issue": "Form feed placement",
-            "expected": expected_form_feeds[:-1],
+            "expected": list(expected_form_feeds),
             "actual": form_feed_lines,
             "description": "Form feeds should appear after every 25th line"
         })
@@ -137,13 +144,80 @@ def validate_embosser_format(file_path):
     validation_results["summary"] = {
         "total_errors": total_errors,
         "total_warnings": len(validation_results["warnings"]),
-        "line_length_compliance": f"{len(lines_all) - len(validation_results['line_length_errors'])}/{len(lines_all)}",
+        "line_length_compliance": f"{stats['lines'] - len(validation_results['line_length_errors'])}/{stats['lines']}",
         "page_structure_valid": len(validation_results["page_length_errors"]) == 0,
         "character_compliance": len(validation_results["character_errors"]) == 0
     }
     
     return validation_results
 
+def _validate_page(validation_results, page_num, lines, is_last_page, page_start):
+    """
+    Check one page of a Braille file and record any errors found.
+    
+    Args:
+        validation_results (dict): Results being built by validate_embosser_format
+        page_num (int): 1-based page number
+        lines (list): Lines on the page
+        is_last_page (bool): Whether this is the final page of the file
+        page_start (int): Number of lines on all previous pages
+    """
+    
+    # Check page length (should be exactly 25 lines for complete pages)
+    if not is_last_page:
+        if len(lines) != 25:
+            validation_results["page_length_errors"].append({
+                "page": page_num,
+                "expected": 25,
+                "actual": len(lines),
+                "issue": f"Page {page_num} has {len(lines)} lines, expected 25"
+            })
+            validation_results["valid"] = False
+    else:  # Last page can have fewer lines
+        if len(lines) > 25:
+            validation_results["page_length_errors"].append({
+                "page": page_num,
+                "expected": "≤25",
+                "actual": len(lines),
+                "issue": f"Last page {page_num} has {len(lines)} lines, maximum 25"
+            })
+            validation_results["valid"] = False
+    
+    # Validate each line in the page
+    for line_num, line in enumerate(lines, 1):
+        # Check line length (should be exactly 40 characters)
+        if len(line) != 40:
+            validation_results["line_length_errors"].append({
+                "page": page_num,
+                "line": line_num,
+                "global_line": page_start + line_num,
+                "expected": 40,
+                "actual": len(line),
+                "content": line[:50] + "..." if len(line) > 50 else line
+            })
+            validation_results["valid"] = False
+        
+        # Check for valid characters (Braille Unicode + spaces + number indicator);
+        # skip clean lines with one C-level containment check
+        if _VALID_LINE_CHARS.issuperset(line):
+            continue
+        for char_pos, char in enumerate(line):
+            if char != ' ' and not '\u2800' <= char <= '\u28FF':
+                validation_results["character_errors"].append({
+                    "page": page_num,
+                    "line": line_num,
+                    "global_line": page_start + line_num,
+                    "position": char_pos + 1,
+                    "character": char,
+                    "unicode": f"U+{ord(char):04X}",
+                    "issue": f"Non-Braille character '{char}' found"
+                })
+                validation_results["valid"] = False
+
+def _format_report_section(title, lines):
+    """Format a titled report section followed by a blank line."""
+    return "\n".join([title, _REPORT_RULE, *lines]) + "\n\n"
+
 def generate_validation_report(validation_results):
     """
     Generate a human-readable validation report.
@@ -158,101 +232,85 @@ def generate_validation_report(validation_results):
     if "error" in validation_results:
         return f"❌ Validation Error: {validation_results['error']}"
     
-    report = []
     results = validation_results
-    
-    # Header
-    report.append("🖨️  BRAILLE EMBOSSER VALIDATION REPORT")
-    report.append("=" * 50)
-    report.append(f"📄 File: {results['file_path']}")
-    report.append("")
+    summary = results["summary"]
     
     # Overall status
     if results["valid"]:
-        report.append("✅ VALIDATION PASSED - File meets all embosser standards!")
+        status = "✅ VALIDATION PASSED - File meets all embosser standards!"
     else:
-        report.append("❌ VALIDATION FAILED - Issues found that need attention")
+        status = "❌ VALIDATION FAILED - Issues found that need attention"
     
-    report.append("")
-    
-    # Summary statistics
-    report.append("📊 SUMMARY STATISTICS")
-    report.append("-" * 30)
-    report.append(f"Total pages: {results['total_pages']}")
-    report.append(f"Total lines: {results['total_lines']}")
-    report.append(f"Form feeds: {results['form_feeds']}")
-    report.append(f"Total errors: {results['summary']['total_errors']}")
-    report.append(f"Total warnings: {results['summary']['total_warnings']}")
-    report.append("")
-    
-    # Detailed compliance
-    report.append("📏 COMPLIANCE DETAILS")
-    report.append("-" * 30)
-    report.append(f"Line length (40 chars): {results['summary']['line_length_compliance']}")
-    report.append(f"Page structure: {'✅ Valid' if results['summary']['page_structure_valid'] else '❌ Invalid'}")
-    report.append(f"Character compliance: {'✅ Valid' if results['summary']['character_compliance'] else '❌ Invalid'}")
-    report.append("")
+    # Only the error sections vary in shape; everything else is a fixed template
+    sections = []
     
     # Line length errors
     if results["line_length_errors"]:
-        report.append("❌ LINE LENGTH ERRORS")
-        report.append("-" * 30)
-        for error in results["line_length_errors"][:10]:  # Show first 10
-            report.append(f"Page {error['page']}, Line {error['line']}: "
-                         f"{error['actual']} chars (expected 40)")
-        if len(results["line_length_errors"]) > 10:
-            report.append(f"... and {len(results['line_length_errors']) - 10} more errors")
-        report.append("")
+        errors = results["line_length_errors"]
+        lines = [f"Page {error['page']}, Line {error['line']}: "
+                 f"{error['actual']} chars (expected 40)"
+                 for error in errors[:10]]  # Show first 10
+        if len(errors) > 10:
+            lines.append(f"... and {len(errors) - 10} more errors")
+        sections.append(_format_report_section("❌ LINE LENGTH ERRORS", lines))
     
     # Page length errors
     if results["page_length_errors"]:
-        report.append("❌ PAGE LENGTH ERRORS")
-        report.append("-" * 30)
-        for error in results["page_length_errors"]:
-            report.append(f"Page {error['page']}: {error['issue']}")
-        report.append("")
+        lines = [f"Page {error['page']}: {error['issue']}"
+                 for error in results["page_length_errors"]]
+        sections.append(_format_report_section("❌ PAGE LENGTH ERRORS", lines))
     
     # Character errors
     if results["character_errors"]:
-        report.append("❌ CHARACTER ERRORS")
-        report.append("-" * 30)
-        for error in results["character_errors"][:5]:  # Show first 5
-            report.append(f"Page {error['page']}, Line {error['line']}, Pos {error['position']}: "
-                         f"Invalid character '{error['character']}' ({error['unicode']})")
-        if len(results["character_errors"]) > 5:
-            report.append(f"... and {len(results['character_errors']) - 5} more character errors")
-        report.append("")
+        errors = results["character_errors"]
+        lines = [f"Page {error['page']}, Line {error['line']}, Pos {error['position']}: "
+                 f"Invalid character '{error['character']}' ({error['unicode']})"
+                 for error in errors[:5]]  # Show first 5
+        if len(errors) > 5:
+            lines.append(f"... and {len(errors) - 5} more character errors")
+        sections.append(_format_report_section("❌ CHARACTER ERRORS", lines))
     
     # Warnings
     if results["warnings"]:
-        report.append("⚠️  WARNINGS")
-        report.append("-" * 30)
-        for warning in results["warnings"]:
-            report.append(f"{warning['issue']}: {warning['description']}")
-        report.append("")
+        lines = [f"{warning['issue']}: {warning['description']}"
+                 for warning in results["warnings"]]
+        sections.append(_format_report_section("⚠️  WARNINGS", lines))
     
     # Recommendations
     if not results["valid"]:
-        report.append("🔧 RECOMMENDATIONS")
-        report.append("-" * 30)
+        lines = []
         if results["line_length_errors"]:
-            report.append("• Fix line length errors - each line must be exactly 40 characters")
+            lines.append("• Fix line length errors - each line must be exactly 40 characters")
         if results["page_length_errors"]:
-            report.append("• Fix page structure - each page should have exactly 25 lines")
+            lines.append("• Fix page structure - each page should have exactly 25 lines")
         if results["character_errors"]:
-            report.append("• Remove or convert invalid characters to proper Braille Unicode")
-        report.append("• Rerun the embosser formatter to fix formatting issues")
-        report.append("")
-    
-    report.append("📋 EMBOSSER STANDARDS REFERENCE")
-    report.append("-" * 30)
-    report.append("• Line Length: Exactly 40 characters")
-    report.append("• Page Length: Exactly 25 lines")
-    report.append("• Page Breaks: Form feed (\\f) after every 25 lines")
-    report.append("• Characters: Unicode Braille patterns (U+2800-U+28FF)")
-    report.append("• Grade: Grade 1 Braille (no contractions)")
-    
-    return "\n".join(report)
+            lines.append("• Remove or convert invalid characters to proper Braille Unicode")
+        lines.append("• Rerun the embosser formatter to fix formatting issues")
+        sections.append(_format_report_section("🔧 RECOMMENDATIONS", lines))
+    
+    return (
+        f"{_REPORT_HEADER}"
+        f"📄 File: {results['file_path']}\n"
+        f"\n"
+        f"{status}\n"
+        f"\n"
+        f"📊 SUMMARY STATISTICS\n"
+        f"{_REPORT_RULE}\n"
+        f"Total pages: {results['total_pages']}\n"
+        f"Total lines: {results['total_lines']}\n"
+        f"Form feeds: {results['form_feeds']}\n"
+        f"Total errors: {summary['total_errors']}\n"
+        f"Total warnings: {summary['total_warnings']}\n"
+        f"\n"
+        f"📏 COMPLIANCE DETAILS\n"
+        f"{_REPORT_RULE}\n"
+        f"Line length (40 chars): {summary['line_length_compliance']}\n"
+        f"Page structure: {'✅ Valid' if summary['page_structure_valid'] else '❌ Invalid'}\n"
+        f"Character compliance: {'✅ Valid' if summary['character_compliance'] else '❌ Invalid'}\n"
+        f"\n"
+        f"{''.join(sections)}"
+        f"{_REPORT_STANDARDS_REFERENCE}"
+    )
 
 def main():
     """Main function for command-line usage"""
@@ -277,8 +335,11 @@ def main():
     file_path = sys.argv[1]
     output_file = sys.argv[2] if len(sys.argv) > 2 else None
     
-    print(f"🔍 Validating Braille file: {file_path}")
-    print("=" * 40)
+    # Console output is collected and written to stdout in one call
+    messages = [
+        f"🔍 Validating Braille file: {file_path}",
+        "=" * 40,
+    ]
     
     # Perform validation
     results = validate_embosser_format(file_path)
@@ -290,15 +351,18 @@ def main():
     if output_file:
         with open(output_file, 'w', encoding='utf-8') as f:
             f.write(report)
-        print(f"📄 Validation report saved to: {output_file}")
-        print("")
+        messages.append(f"📄 Validation report saved to: {output_file}")
+        messages.append("")
         # Show summary in console
         if results.get("valid"):
-            print("✅ VALIDATION PASSED - File is ready for embosser printing!")
+            messages.append("✅ VALIDATION PASSED - File is ready for embosser printing!")
         else:
-            print("❌ VALIDATION FAILED - Please check the detailed report.")
+            messages.append("❌ VALIDATION FAILED - Please check the detailed report.")
     else:
-        print(report)
+        messages.append(report)
+    
+    sys.stdout.write("\n".join(messages) + "\n")
+    sys.stdout.flush()
 
 if __name__ == "__main__":
     main()
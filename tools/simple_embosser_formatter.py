@@ -3,15 +3,65 @@
 Simple Braille Embosser Formatter - Clean implementation for embosser standards
 """
 
+import itertools
 import json
 import os
 import sys
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'core'))
 from braille_converter import load_config, text_to_braille_unicode
 
-def format_for_embosser_simple(braille_text, line_length=40, page_length=25, include_page_numbers=True):
+# Write buffer for embosser output; pages are streamed in and flushed in large chunks
+IO_BUFFER_SIZE = 1 << 17  # 128 KiB
+
+# Braille numbers for page numbering
+BRAILLE_NUMBERS = {
+    '0': '\u281a', '1': '\u2801', '2': '\u2803', '3': '\u2809', '4': '\u2819',
+    '5': '\u2811', '6': '\u280b', '7': '\u281b', '8': '\u2813', '9': '\u280a'
+}
+NUMBER_INDICATOR = '\u283c'  # ⠼
+_DIGIT_TRANS = str.maketrans(BRAILLE_NUMBERS)
+
+def _iter_wrapped_lines(text, line_length, blank_line):
+    """Yield padded, word-wrapped lines for each paragraph of text."""
+    first_paragraph = True
+    
+    # Handle paragraph breaks - split by double newlines. Each paragraph is
+    # split into words exactly once; whitespace-only paragraphs are skipped.
+    for paragraph in text.split('\n\n'):
+        words = paragraph.split()
+        if not words:
+            continue
+        
+        if not first_paragraph:  # Add blank line between paragraphs
+            yield blank_line
+        first_paragraph = False
+        
+        # Word wrap within paragraph, tracking the running width so each
+        # line is joined only once instead of rebuilt for every word
+        line_words = []
+        width = -1
+        
+        for word in words:
+            width += len(word) + 1
+            if width > line_length and line_words:
+                # Line is full, save it and start new line
+                yield ' '.join(line_words).ljust(line_length)
+                line_words = [word]
+                width = len(word)
+            else:
+                line_words.append(word)
+        
+        # Add the last line of paragraph
+        if line_words:
+            yield ' '.join(line_words).ljust(line_length)
+
+def iter_format_for_embosser_simple(braille_text, line_length=40, page_length=25, include_page_numbers=True):
     """
-    Simple, clean formatting for embosser printing.
+    Streaming version of format_for_embosser_simple.
+    
+    Yields the formatted output one page at a time, so only a single page
+    is held in memory. Joining the yielded chunks gives exactly the string
+    returned by format_for_embosser_simple.
     
     Args:
         braille_text (str): Input Braille text
@@ -19,85 +69,54 @@ def format_for_embosser_simple(braille_text, line_length=40, page_length=25, inc
         page_length (int): Lines per page (default 25)
         include_page_numbers (bool): Include page numbers (default True)
     
-    Returns:
-        str: Properly formatted Braille for embosser
+    Yields:
+        str: One formatted page, preceded by a form feed for every page after the first
     """
     
-    # Braille numbers for page numbering
-    braille_numbers = {
-        '0': '\u281a', '1': '\u2801', '2': '\u2803', '3': '\u2809', '4': '\u2819',
-        '5': '\u2811', '6': '\u280b', '7': '\u281b', '8': '\u2813', '9': '\u280a'
-    }
-    NUMBER_INDICATOR = '\u283c'  # ⠼
-    
     def to_braille_number(num):
-        return NUMBER_INDICATOR + ''.join(braille_numbers[d] for d in str(num))
+        return NUMBER_INDICATOR + str(num).translate(_DIGIT_TRANS)
     
-    # Step 1: Clean and normalize text
-    text = braille_text.replace('\t', '  ')  # Convert tabs to 2 spaces
+    blank_line = ' ' * line_length
     
-    # Step 2: Handle paragraph breaks - split by double newlines
-    paragraphs = [p.strip() for p in text.split('\n\n') if p.strip()]
-    
-    # Step 3: Word wrap each paragraph
-    all_lines = []
-    
-    for i, paragraph in enumerate(paragraphs):
-        if i > 0:  # Add blank line between paragraphs
-            all_lines.append(' ' * line_length)
-        
-        # Word wrap within paragraph
-        words = paragraph.split()
-        current_line = ""
-        
-        for word in words:
-            if not current_line:
-                current_line = word
-            elif len(current_line + ' ' + word) <= line_length:
-                current_line += ' ' + word
-            else:
-                # Line is full, save it and start new line
-                all_lines.append(current_line.ljust(line_length))
-                current_line = word
-        
-        # Add the last line of paragraph
-        if current_line:
-            all_lines.append(current_line.ljust(line_length))
+    # Steps 1-3: Split paragraphs and word wrap them lazily. Tabs need no
+    # separate expansion pass since word splitting treats them as spaces.
+    lines = _iter_wrapped_lines(braille_text, line_length, blank_line)
     
     # Step 4: Format into pages
-    formatted_output = []
-    page_num = 1
-    
-    i = 0
-    while i < len(all_lines):
-        # Start a new page
-        page_lines = []
-        
-        # Add content lines (leaving room for page number if needed)
-        content_lines_per_page = page_length - (1 if include_page_numbers else 0)
-        
-        for j in range(content_lines_per_page):
-            if i + j < len(all_lines):
-                page_lines.append(all_lines[i + j])
-            else:
-                page_lines.append(' ' * line_length)  # Fill with blank lines
+    # Content lines per page (leaving room for page number if needed)
+    content_lines_per_page = page_length - (1 if include_page_numbers else 0)
+    
+    for page_num in itertools.count(1):
+        page_lines = list(itertools.islice(lines, content_lines_per_page))
+        if not page_lines:
+            break
+        if len(page_lines) < content_lines_per_page:
+            page_lines.extend([blank_line] * (content_lines_per_page - len(page_lines)))  # Fill with blank lines
         
         # Add page number line if enabled
         if include_page_numbers:
             page_num_line = to_braille_number(page_num).rjust(line_length)
             page_lines.append(page_num_line)
         
-        # Add this page to output
-        formatted_output.extend(page_lines)
-        
         # Add form feed between pages (except after last page)
-        i += content_lines_per_page
-        if i < len(all_lines):
-            formatted_output.append('\f')
-        
-        page_num += 1
+        page = '\n'.join(page_lines)
+        yield page if page_num == 1 else '\n\f\n' + page
+
+def format_for_embosser_simple(braille_text, line_length=40, page_length=25, include_page_numbers=True):
+    """
+    Simple, clean formatting for embosser printing.
+    
+    Args:
+        braille_text (str): Input Braille text
+        line_length (int): Characters per line (default 40)
+        page_length (int): Lines per page (default 25)
+        include_page_numbers (bool): Include page numbers (default True)
     
-    return '\n'.join(formatted_output)
+    Returns:
+        str: Properly formatted Braille for embosser
+    """
+    return ''.join(iter_format_for_embosser_simple(
+        braille_text, line_length, page_length, include_page_numbers))
 
 def main():
     """Simple command line interface"""
@@ -120,18 +139,19 @@ def main():
         text = f.read()
     
     braille_text = text_to_braille_unicode(text, config)
-    formatted_braille = format_for_embosser_simple(braille_text)
-    
-    # Write output
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(formatted_braille)
     
-    # Statistics
-    lines = formatted_braille.split('\n')
-    pages = formatted_braille.count('\f') + 1
+    # Write output page by page, collecting statistics as we go
+    line_count = 1
+    pages = 0
+    with open(output_file, 'w', encoding='utf-8', buffering=IO_BUFFER_SIZE) as f:
+        for page in iter_format_for_embosser_simple(braille_text):
+            f.write(page)
+            line_count += page.count('\n')
+            pages += 1
+    pages = max(pages, 1)
     
     print(f"💾 Saved: {output_file}")
-    print(f"📊 Statistics: {len(lines)} lines, {pages} pages")
+    print(f"📊 Statistics: {line_count} lines, {pages} pages")
     print(f"✅ Ready for embosser!")
 
 if __name__ == "__main__":